@@ -60,6 +60,13 @@ class VisualizeActionBase(ActionBase):
         # I have a doubt here, this is not called for SAB.
         # But canvas redrawed, widgets redrawed because of thread ends?
 
+    @staticmethod
+    def VisibleSlice(values: np.ndarray, lim: tuple[float, float]) -> slice:
+        # indexes of ascending `values` within axis limits, for views that re-decimate when zoomed
+        # one more on each side, so the drawing reaches the axis edges
+        i0, i1 = np.searchsorted(values, sorted(lim))
+        return slice(max(i0-1, 0), i1+1)
+
 PAB = ProcessActionBase
 VAB = VisualizeActionBase
 
@@ -1,7 +1,7 @@
 import numpy as np
 from . import BallBearing, GearboxDefinition, BearingInputStage
 from dac.modules.timedata import TimeData
-from dac.core.actions import VAB, PAB, SAB, ActionBase
+from dac.core.actions import VAB, SAB, ActionBase
 from dac.modules.timedata.actions import ShowTimeDataAction
 from dac.modules.nvh.data import OrderList, OrderInfo
 from dac.modules.nvh.actions import ViewFreqDomainAction
@@ -1,13 +1,15 @@
 import numpy as np
 from collections import defaultdict
 from matplotlib.gridspec import GridSpec
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 from matplotlib.widgets import TextBox, RadioButtons
 from matplotlib.axes import Axes
 
 from dac.core.data import SimpleDefinition
-from dac.core.actions import ActionBase, VAB, PAB, SAB
+from dac.core.actions import ActionBase, VAB, PAB
 from dac.modules.timedata import TimeData
-from . import WindowType, BandCorrection, BinMethod, AverageType, ToleranceType
+from . import WindowType, BandCorrection, AverageType, ToleranceType
 from .data import FreqIntermediateData, DataBins, FreqDomainData, \
                   OrderInfo, OrderList, SliceData, OrderSliceData
 
@@ -30,7 +32,7 @@ class ToFreqDomainAction(PAB):
             else:
                 window = WindowType.Uniform
                 windowed_y = ch.y
-            fdata = np.fft.fft(windowed_y) / batch_N * window.value[corr.value]
+            fdata = np.fft.rfft(windowed_y) / batch_N * window.value[corr.value] # real input, only half spectrum needed
 
             double_spec = fdata[:int(np.ceil(batch_N/2))]
             double_spec[1:] *= 2
@@ -50,35 +52,16 @@ class ToFreqIntermediateAction(PAB):
         
         freqs = []
 
-        window_funcs = {
-            WindowType.Hanning: np.hanning,
-            WindowType.Hamming: np.hamming,
-        }
-
         if ref_channel is not None:
             ref_batches = ref_channel.to_bins(df=resolution, overlap=overlap)
             ref_bins_y = np.mean(ref_batches, axis=1)
             ref_bins = DataBins(name=ref_channel.name, y=ref_bins_y, y_unit=ref_channel.y_unit)
-        # else:
-        #     create a TimeData channel, but don't know the length
+        else:
+            ref_bins = None # time bins, created per channel
 
         n = len(channels)
         for i, channel in enumerate(channels):
-            batches = channel.to_bins(df=resolution, overlap=overlap)
-            N_batches, batch_N = batches.shape
-
-            if ref_channel is None:
-                ref_bins_y = np.arange(N_batches) * 1/resolution * (1-overlap)
-                ref_bins = DataBins(name="Time", y=ref_bins_y, y_unit="s")
-                ref_bins._method = BinMethod.Min
-
-            batches = batches * window_funcs[window](batch_N)
-            batches_fft = np.fft.fft(batches) / batch_N * window.value[corr.value]
-
-            double_spec = batches_fft[:, :int(np.ceil(batch_N/2))]
-            double_spec[:, 1:] *= 2
-
-            freq = FreqIntermediateData(name=channel.name, z=double_spec, df=resolution, z_unit=channel.y_unit, ref_bins=ref_bins)
+            freq = FreqIntermediateData.FromTimeData(channel, window=window, corr=corr, resolution=resolution, overlap=overlap, ref_bins=ref_bins)
             freqs.append(freq)
             self.progress(i+1, n)
 
@@ -112,12 +95,47 @@ class ViewFreqDomainAction(VAB):
         if xlim: ax.set_xlim(xlim)
         if ylim: ax.set_ylim(ylim)
 
-        for channel in channels:
-            ax.plot(channel.x, channel.amplitude, label=f"{channel.name} [{channel.y_unit}]")
+        if len(channels) > 8:
+            # one `Line2D` per channel dominates the draw time, batch them into one artist
+            colors = [f"C{i}" for i in range(len(channels))]
+            ax.add_collection(LineCollection(
+                [np.column_stack((channel.x, channel.amplitude)) for channel in channels],
+                colors=colors, linewidths=1.0,
+            ))
+            ax.autoscale_view()
             if with_phase:
-                ax_p.plot(channel.x, channel.phase)
-
-        ax.legend(loc="upper right")
+                ax_p.add_collection(LineCollection(
+                    [np.column_stack((channel.x, channel.phase)) for channel in channels],
+                    colors=colors, linewidths=1.0,
+                ))
+                ax_p.autoscale_view()
+
+            handles = [Line2D([], [], color=color) for color in colors] # proxy artists for legend
+            ax.legend(handles, [f"{channel.name} [{channel.y_unit}]" for channel in channels], loc="upper right")
+        else:
+            for channel in channels:
+                ax.plot(channel.x, channel.amplitude, label=f"{channel.name} [{channel.y_unit}]")
+                if with_phase:
+                    ax_p.plot(channel.x, channel.phase)
+
+            ax.legend(loc="upper right")
+
+def _max_decimate(xs: np.ndarray, ys: np.ndarray, zs: np.ndarray, nx: int, ny: int):
+    # block maximum to about (ny, nx) cells, the spectral peaks are preserved
+    bx = max(1, len(xs) // nx)
+    by = max(1, len(ys) // ny)
+    if bx > 1:
+        zs = np.maximum.reduceat(zs, np.arange(0, len(xs), bx), axis=1)
+    if by > 1:
+        zs = np.maximum.reduceat(zs, np.arange(0, len(ys), by), axis=0)
+
+    return xs[::bx], ys[::by], zs
+
+def _mesh_extent(vs: np.ndarray) -> tuple[float, float]:
+    # outer cell edges as `pcolormesh` draws them, centred on the values
+    if len(vs) < 2:
+        return vs[0]-0.5, vs[0]+0.5
+    return vs[0]-(vs[1]-vs[0])/2, vs[-1]+(vs[-1]-vs[-2])/2
 
 class ViewFreqIntermediateAction(VAB):
     CAPTION = "Show FFT color plot"
@@ -136,13 +154,32 @@ class ViewFreqIntermediateAction(VAB):
         ax.set_xlabel("Frequency [Hz]")
         if (ref_bins:=channel.ref_bins) is not None:
             ys = channel.ref_bins.y
-            idx = np.argsort(ys)
-            ys = ys[idx]
-            zs = zs[idx]
+            if not ref_bins.is_ascending: # no copy of `z` for time or run-up speed
+                idx = np.argsort(ys, kind='stable')
+                ys = ys[idx]
+                zs = zs[idx]
             ax.set_ylabel(f"{ref_bins.name} [{ref_bins.y_unit}]")
-        m = ax.pcolormesh(xs, ys, np.abs(zs), cmap='jet', vmin=cmin, vmax=cmax)
+        amps = np.abs(zs)
+        nx, ny = int(ax.bbox.width), int(ax.bbox.height) # about one cell per pixel
+        m = ax.pcolormesh(*_max_decimate(xs, ys, amps, nx, ny), cmap='jet', vmin=cmin, vmax=cmax)
         cb = fig.colorbar(m)
         cb.set_label(f"Amplitude [{channel.z_unit}]")
+        # full view set up front, the lazy autoscale would otherwise fire the callbacks below with the default limits
+        ax.set_xlim(_mesh_extent(xs))
+        ax.set_ylim(_mesh_extent(ys))
+
+        def on_lim_changed(ax: Axes):
+            nonlocal m
+            vx, vy = self.VisibleSlice(xs, ax.get_xlim()), self.VisibleSlice(ys, ax.get_ylim())
+            if min(len(xs[vx]), len(ys[vy])) < 2: # too few cells for a mesh
+                return
+            norm = m.norm
+            m.remove()
+            m = ax.pcolormesh(*_max_decimate(xs[vx], ys[vy], amps[vy, vx], nx, ny), cmap='jet', norm=norm)
+            cb.update_normal(m) # colorbar follows the new mesh
+
+        ax.callbacks.connect('xlim_changed', on_lim_changed)
+        ax.callbacks.connect('ylim_changed', on_lim_changed)
         if xlim is not None:
             ax.set_xlim(xlim)
 
@@ -229,7 +266,7 @@ class ViewOrderSlice(VAB):
 
         ax_orders = fig.add_axes([0.91, 0.13, 0.08, 0.2])
         ax_method = fig.add_axes([0.91, 0.01, 0.08, 0.1])
-        order_labels = ["None"] + [order.name for order in order_slice.slices]
+        order_labels = ["None"] + [order.name for order in order_slice.orders]
         order_choice: OrderInfo | None = None
         order_selector = RadioButtons(ax_orders, order_labels, active=0)
         method_labels = ['By frequency', 'By reference']
@@ -238,7 +275,7 @@ class ViewOrderSlice(VAB):
 
         def order_change(label):
             nonlocal order_choice
-            for order in order_slice.slices:
+            for order in order_slice.orders:
                 if order.name==label:
                     order_choice = order
                     break
@@ -257,7 +294,7 @@ class ViewOrderSlice(VAB):
             if order_choice is None:
                 fig.canvas.draw_idle()
                 return
-            slice = order_slice.slices[order_choice]
+            slice = order_slice[order_choice]
             if method_choice==0: # by freq
                 x, y = slice.get_aligned_f()
             else:
@@ -282,8 +319,8 @@ class ViewOrderSliceOfMeasurements(VAB):
             ctx = self.container.get_context(measurement)
             orderslice: OrderSliceData = ctx.get_node_of_type(orderslice_name, OrderSliceData)
             
-            for oi, sd in orderslice.slices.items():
-                fiad[oi.name].append( (measurement.name, sd,) )
+            for oi in orderslice.orders:
+                fiad[oi.name].append( (measurement.name, orderslice[oi],) )
 
         ax_orders = fig.add_axes([0.91, 0.13, 0.08, 0.2])
         order_names = ["None"] + list(fiad.keys())
@@ -347,6 +384,11 @@ class SpectrumToTimeAction(PAB):
 
 class SpectrumAsTimeAction(PAB):
     CAPTION = "Treate frequency spectrum as TimeData"
+    def __call__(self, channels: list[FreqDomainData]) -> list[TimeData]:
+        rst = []
+        for ch in channels:
+            rst.append(ch.as_timedomain())
+        return rst
 
 class LoadCaseSpectrumComparison(VAB):
     def __call__(self, loadcases: list[str], channel_name: str):
@@ -1,31 +1,75 @@
 import numpy as np
+from scipy import fft
 from dac.core.data import DataBase
-from . import BinMethod, AverageType
+from . import BinMethod, AverageType, WindowType, BandCorrection
 from ..timedata import TimeData
 from collections import namedtuple
 
+def _energy_mean(z: np.ndarray) -> np.ndarray:
+    # = np.mean(np.abs(z)**2, axis=0), but single pass without (batches x lines) temporaries
+    z = np.atleast_2d(z)
+    return (np.einsum('ij,ij->j', z.real, z.real) + np.einsum('ij,ij->j', z.imag, z.imag)) / z.shape[0]
+
+def _uniform_bin_indices(values: np.ndarray, start: float, stop: float, num: int):
+    # bins of equal width need no search, the index is plain arithmetic
+    # [start, stop] split into `num` bins, the last one includes `stop`
+    idxes = np.floor((values-start) * (num/(stop-start))).astype(np.intp)
+    valid = (values>=start) & (values<=stop)
+    np.clip(idxes, 0, num-1, out=idxes)
+    return idxes, valid
+
+def _cross_mean(ref_z: np.ndarray, z: np.ndarray, block: int=64) -> np.ndarray:
+    # = np.mean(np.conj(ref_z) * z, axis=0), accumulated by blocks of batches
+    # the temporaries stay (block x lines), instead of (batches x lines)
+    ref_z, z = np.atleast_2d(ref_z), np.atleast_2d(z)
+    acc = np.zeros(z.shape[1], dtype=np.result_type(ref_z, z, np.complex64))
+    for i in range(0, z.shape[0], block):
+        cross = np.conj(ref_z[i:i+block])
+        cross *= z[i:i+block]
+        acc += cross.sum(axis=0)
+    return acc / z.shape[0]
+
 class ProcessPackage: # bundle channels and ref_channel
     ...
 
 class DataBins(DataBase):
-    def __init__(self, name: str = None, uuid: str = None, y: np.ndarray=None, y_unit: str = "-") -> None:
+    def __init__(self, name: str = None, uuid: str = None, y: np.ndarray=None, y_unit: str = "-", dtype: np.dtype=None) -> None:
         super().__init__(name, uuid)
 
-        self.y = y if y is not None else np.array([])
+        # `dtype` e.g. np.float32 to halve memory, None to keep as is
+        self.y = np.asarray(y, dtype=dtype) if y is not None else np.array([], dtype=dtype)
         self.y_unit = y_unit
         self._method = BinMethod.Mean
+        self._ascending_src = None
+        self._ascending = None
+
+    @property
+    def is_ascending(self) -> bool:
+        # cached until `y` replaced, usually true for time or run-up speed
+        if self._ascending_src is not self.y:
+            self._ascending = bool(np.all(np.diff(self.y) >= 0))
+            self._ascending_src = self.y
+        return self._ascending
 
 class FreqDomainData(DataBase):
-    def __init__(self, name: str = None, uuid: str = None, y: np.ndarray=None, df: float=1, y_unit: str="-") -> None:
+    def __init__(self, name: str = None, uuid: str = None, y: np.ndarray=None, df: float=1, y_unit: str="-", dtype: np.dtype=None) -> None:
         super().__init__(name, uuid)
     
-        self.y = y if y is not None else np.array([]) # complex number
+        # `dtype` e.g. np.complex64 to halve memory, None to keep as is
+        self.y = np.asarray(y, dtype=dtype) if y is not None else np.array([], dtype=dtype) # complex number
         self.y_unit = y_unit
         self.df = df
+        self._x_key = None
+        self._x_cache = None
 
     @property
     def x(self):
-        return np.arange(self.lines) * self.df
+        # cached, invalidated when `lines` or `df` changes
+        if self._x_key != (key:=(self.lines, self.df)):
+            self._x_cache = np.arange(self.lines) * self.df
+            self._x_cache.flags.writeable = False
+            self._x_key = key
+        return self._x_cache
     
     @property
     def f(self):
@@ -43,13 +87,26 @@ class FreqDomainData(DataBase):
     def amplitude(self):
         return np.abs(self.y)
     
+    def _band_indices(self, bands: list[tuple[float, float]]):
+        # `x` is k*df, so [ffrom, fto] maps to slice [i_from:i_to] by arithmetic, no `x` needed
+        df, lines = self.df, self.lines
+        edges = np.asarray(bands, dtype=float).reshape(-1, 2)
+        i_froms = np.clip(np.ceil(edges[:, 0]/df), 0, lines).astype(int)
+        i_tos = np.clip(np.floor(edges[:, 1]/df)+1, 0, lines).astype(int)
+
+        # division may round across a line, step back to match `ffrom<=x<=fto` exactly
+        i_froms += (i_froms<lines) & (i_froms*df<edges[:, 0])
+        i_froms -= (i_froms>0) & ((i_froms-1)*df>=edges[:, 0])
+        i_tos -= (i_tos>0) & ((i_tos-1)*df>edges[:, 1])
+        i_tos += (i_tos<lines) & (i_tos*df<=edges[:, 1])
+
+        return zip(i_froms, i_tos)
+
     def remove_spec(self, bands: list[tuple[float, float]]):
         y = self.y.copy()
-        x = self.x
 
-        for ffrom, fto in bands:
-            b = np.all([ffrom<=x, x<=fto], axis=0)
-            y[b] = 0
+        for i_from, i_to in self._band_indices(bands):
+            y[i_from:i_to] = 0
 
         return FreqDomainData(
             name=f"{self.name}-FiltF",
@@ -59,12 +116,18 @@ class FreqDomainData(DataBase):
         )
     
     def keep_spec(self, bands: list[tuple[float, float]]):
-        y = np.zeros_like(self.y)
-        x = self.x
+        y = np.empty_like(self.y)
+        i_done = 0 # y[:i_done] written
 
-        for ffrom, fto in bands:
-            b = np.all([ffrom<=x, x<=fto], axis=0)
-            y[b] = self.y[b]
+        # ascending bands, each line written once: kept lines copied, gaps zeroed
+        for i_from, i_to in sorted(self._band_indices(bands)):
+            i_from = max(i_from, i_done)
+            if i_from >= i_to: # empty band, or overlapped by previous
+                continue
+            y[i_done:i_from] = 0
+            y[i_from:i_to] = self.y[i_from:i_to]
+            i_done = i_to
+        y[i_done:] = 0
 
         return FreqDomainData(
             name=f"{self.name}-ExtractF",
@@ -74,30 +137,43 @@ class FreqDomainData(DataBase):
         )
     
     def integral(self, order: int=1):
-        a = self.x * 1j * 2 * np.pi
-        b = np.zeros(self.lines, dtype="complex")
-        b[1:] = a[1:]**(-order)
-        y = self.y * b
+        # (2j*pi*k*df)^-order = (2j*pi*df)^-order * k^-order: scalar complex factor, real line factor, no `x` needed
+        k = np.arange(1, self.lines, dtype=np.result_type(self.y.real, np.float32)) # f=0 skipped, always 0 after integral
+        b = k ** -order # negative order: derivative
+        factor = (2j * np.pi * self.df) ** -order
+
+        y = np.empty(self.lines, dtype=np.result_type(self.y, np.complex64))
+        y[:1] = 0
+        np.multiply(self.y[1:], b, out=y[1:])
+        y[1:] *= factor
 
         return FreqDomainData(name=f"{self.name}-IntF", y=y, df=self.df, y_unit=self.y_unit+f"*{'s'*order}")    
     
     def effective_value(self, fmin=0, fmax=0):
         # index = (freq > fmin) & (freq <= fmax)
         # effvalue = sqrt(sum(abs(value(index)*new_factor/orig_factor).^2));
+        # fmin<=fmax, both included; fmax<=0 for no upper limit
 
-        return np.sqrt(np.sum(np.abs(self.y)**2))
+        (i_from, i_to), = self._band_indices([(fmin, fmax if fmax > 0 else np.inf)])
+        y = self.y[i_from:i_to]
+        return np.sqrt(np.vdot(y, y).real) # sum of |y|^2 in one pass, no sqrt per line
     
     def to_timedomain(self):
-        single_spec = self.y
-        double_spec = np.concatenate([single_spec, np.conjugate(single_spec[self.lines:0:-1])]) / 2
-        double_spec[0] *= 2
         # I really need to consider saving all spectrum without converting between ss and ds
-        y = np.real(np.fft.ifft(double_spec * len(double_spec)))
+        # the double spectrum is Hermitian, `irfft` mirrors the conjugate part itself
+        # halving all lines but f(0) is linear: scale the output instead of copying the spectrum
+        N = 2*self.lines - 1
+        y = np.fft.irfft(self.y, n=N, norm="forward") # no 1/N in the inverse, amplitude spectrum as is
+        y *= 0.5
+        y += self.y[0].real / 2
 
         return TimeData(name=self.name, y=y, dt=1/(self.lines*self.df*2), y_unit=self.y_unit)
     
     def as_timedomain(self):
-        ...
+        # amplitude spectrum as signal, frequency as "time", e.g. for envelope or cepstrum-like processing
+        # real `y` is shared, not copied
+        y = np.abs(self.y) if np.iscomplexobj(self.y) else self.y
+        return TimeData(name=self.name, y=y, dt=self.df, y_unit=self.y_unit)
 
     def get_amplitudes_at(self, frequencies: list[float], lines: int=3, width: float=None) -> list[tuple[float, float]]:
         if width is not None:
@@ -105,38 +181,89 @@ class FreqDomainData(DataBase):
 
         x = self.x
         y = self.y
-        fas = []
-
-        for f in frequencies:
-            i = np.searchsorted(x, f)
-            y_p = y[max((i-lines), 0):(i+lines)] # i-lines can <0, and (i-lines):(i+lines) return empty
-            x_p = x[max((i-lines), 0):(i+lines)]
-            if len(y_p)==0:
-                fas.append(None)
-                continue
-            i_p = np.argmax(np.abs(y_p))
-            fas.append( (x_p[i_p], y_p[i_p],) )
+        if lines <= 0 or self.lines == 0:
+            return [None for _ in frequencies]
 
-        return fas
+        # all frequencies at once, window of each frequency as a row
+        idxs = np.searchsorted(x, np.asarray(frequencies, dtype=float))
+        win = idxs[:, None] + np.arange(-lines, lines)
+        valid = (win >= 0) & (win < self.lines) # i-lines can <0, and i+lines can >=self.lines
+        win = np.clip(win, 0, self.lines-1)
+        amps = np.where(valid, np.abs(y[win]), -1)
+        picked = win[np.arange(len(idxs)), np.argmax(amps, axis=1)]
+
+        return [
+            (x[i_p], y[i_p],) if any_valid else None
+            for i_p, any_valid in zip(picked, valid.any(axis=1))
+        ]
 
 
 class FreqIntermediateData(DataBase):
-    def __init__(self, name: str = None, uuid: str = None, z: np.ndarray=None, df: float=1, z_unit: str="-", ref_bins: DataBins=None) -> None:
+    def __init__(self, name: str = None, uuid: str = None, z: np.ndarray=None, df: float=1, z_unit: str="-", ref_bins: DataBins=None, dtype: np.dtype=None) -> None:
         super().__init__(name, uuid)
 
-        self.z = z if z is not None else np.array([]) # batches x window_size
+        # `dtype` e.g. np.complex64 to halve memory, None to keep as is
+        self.z = np.asarray(z, dtype=dtype) if z is not None else np.array([], dtype=dtype) # batches x window_size
+        # layout kept as given (C order from the batched FFT): reductions over batches already run line-contiguous,
+        # an F-order copy costs more than one reduction and slows down the blocked cross mean
         self.z_unit = z_unit
         self.df = df
         self.ref_bins = ref_bins
+        self._x_key = None
+        self._x_cache = None
+        self._sorted_src = None
+        self._sorted_cache = None
+        self._power_src = None
+        self._power_cache = None
 
     @property
     def x(self):
-        return np.arange(self.lines) * self.df
+        # cached, invalidated when `lines` or `df` changes
+        if self._x_key != (key:=(self.lines, self.df)):
+            self._x_cache = np.arange(self.lines) * self.df
+            self._x_cache.flags.writeable = False
+            self._x_key = key
+        return self._x_cache
     
     @property
     def f(self):
         return self.x
 
+    @classmethod
+    def FromTimeData(cls, channel: TimeData, window: WindowType=WindowType.Hanning, corr: BandCorrection=BandCorrection.NarrowBand,
+                     resolution: float=0.5, overlap: float=0.75, ref_bins: DataBins=None, dtype: np.dtype=np.complex64) -> "FreqIntermediateData":
+        # `dtype` complex64 by default, single precision is plenty for spectrograms and halves all later reductions
+        # None to follow the time data, `to_complex128` if double precision is needed afterwards
+        batches = channel.to_bins(df=resolution, overlap=overlap) # strided view, no copy
+        real_dtype = np.finfo(dtype).dtype if dtype is not None else np.result_type(batches, np.float32)
+        N_batches, batch_N = batches.shape
+
+        if ref_bins is None:
+            ref_bins = DataBins(name="Time", y=np.arange(N_batches) * 1/resolution * (1-overlap), y_unit="s")
+            ref_bins._method = BinMethod.Min
+
+        window_funcs = {
+            WindowType.Hanning: np.hanning,
+            WindowType.Hamming: np.hamming,
+        }
+        if window in window_funcs:
+            batches = np.multiply(batches, window_funcs[window](batch_N), dtype=real_dtype)
+        else:
+            window = WindowType.Uniform
+            batches = batches.astype(real_dtype, copy=False)
+
+        # all batches in one 2-D real transform, batches shared among threads
+        # single precision in, single precision out: no cast of the result
+        batches_fft = fft.rfft(batches, axis=1, workers=-1)
+        batches_fft *= 2 * window.value[corr.value] / batch_N
+        double_spec = batches_fft[:, :int(np.ceil(batch_N/2))]
+        double_spec[:, 0] /= 2 # f(0) not doubled
+
+        return cls(name=channel.name, z=double_spec, df=resolution, z_unit=channel.y_unit, ref_bins=ref_bins)
+
+    def to_complex128(self) -> "FreqIntermediateData":
+        return FreqIntermediateData(name=self.name, z=self.z, df=self.df, z_unit=self.z_unit, ref_bins=self.ref_bins, dtype=np.complex128)
+
     def _bl(self):
         if len(shape:=self.z.shape)==0:
             # shape == ()
@@ -158,73 +285,91 @@ class FreqIntermediateData(DataBase):
         batches, _ = self._bl()
         return batches
     
+    def _sorted_by_ref(self) -> tuple[np.ndarray, np.ndarray]:
+        # (ys, zs) ascending by reference value, cached until `z` or `ref_bins.y` replaced
+        # no copy if already ascending (e.g. time as reference)
+        ys = self.ref_bins.y
+        if self._sorted_src is None or self._sorted_src[0] is not self.z or self._sorted_src[1] is not ys:
+            if self.ref_bins.is_ascending:
+                zs = self.z
+            else:
+                idx = np.argsort(ys, kind='stable')
+                ys, zs = ys[idx], self.z[idx]
+            self._sorted_cache = (ys, zs)
+            self._sorted_src = (self.z, self.ref_bins.y) # keep the sources, so the identities stay valid
+        return self._sorted_cache
+
+    def _auto_power_mean(self) -> np.ndarray:
+        # mean(|z|^2) over batches, cached until `z` replaced
+        if self._power_src is not self.z:
+            self._power_cache = _energy_mean(self.z)
+            self._power_cache.flags.writeable = False
+            self._power_src = self.z
+        return self._power_cache
+
     def to_powerspectrum(self, average_by: AverageType=AverageType.Energy):
         if average_by==AverageType.Energy:
-            y = np.sqrt(np.mean(np.abs(self.z)**2, axis=0))
+            y = np.sqrt(self._auto_power_mean())
         elif average_by==AverageType.Linear:
             y = np.mean(np.abs(self.z), axis=0)
         return FreqDomainData(name=self.name, y=y, df=self.df, y_unit=self.z_unit)
     
-    def rectify_to(self, x_slice: tuple, y_slice: tuple) -> "FreqIntermediateData":
-        ref_bins = self.ref_bins
-        ys = ref_bins.y
-        idx = np.argsort(ys)
-        ys = ys[idx]
-        zs = self.z[idx]
-
+    def rectify_to(self, x_slice: tuple[float, float, int], y_slice: tuple[float, float, int]) -> "FreqIntermediateData":
+        # re-grid to uniform bins, e.g. uneven speed steps to even ones
+        # slice: (start, stop, number of bins), stop included; bins labelled by their left edge
+        ys = self.ref_bins.y # binning needs no sorting
+        zs = self.z
         xs = self.x # the frequencies
 
-        x_bins = np.arange(x_slice)
-        x_idxes = np.digitize(xs, x_bins)
-        y_bins = np.arange(y_bins)
-        y_idxes = np.digitize(ys, y_bins)
-
-        # average by energy
-        for y in ys:
-            for x in xs:
-                pass
-
-        return FreqIntermediateData
+        x_from, x_to, x_num = x_slice
+        y_from, y_to, y_num = y_slice
+        if x_from != 0:
+            raise ValueError("x_slice must start from 0, `x` of FreqIntermediateData always does")
+        x_idxes, x_valid = _uniform_bin_indices(xs, x_from, x_to, x_num)
+        y_idxes, y_valid = _uniform_bin_indices(ys, y_from, y_to, y_num)
+
+        # average by energy, all cells at once
+        # flat cell index per (batch, line), summed by `bincount` instead of unbuffered `np.add.at`
+        cells = y_idxes[y_valid, None] * x_num + x_idxes[None, x_valid]
+        z_sq_sum = np.bincount(cells.ravel(), weights=(np.abs(zs[y_valid][:, x_valid])**2).ravel(), minlength=y_num*x_num)
+        z_sq_sum = z_sq_sum.reshape(y_num, x_num).astype(zs.real.dtype, copy=False)
+        # each batch hits every line, so the count of a cell is (batches in y bin) * (lines in x bin)
+        counts = np.outer(np.bincount(y_idxes[y_valid], minlength=y_num), np.bincount(x_idxes[x_valid], minlength=x_num))
+        z = np.sqrt(np.divide(z_sq_sum, counts, out=np.zeros_like(z_sq_sum), where=counts>0)) # empty cell as 0
+
+        y_width = (y_to-y_from) / y_num
+        ref_bins = DataBins(name=self.ref_bins.name, y=y_from+np.arange(y_num)*y_width, y_unit=self.ref_bins.y_unit)
+        ref_bins._method = BinMethod.Min
+        return FreqIntermediateData(
+            name=f"{self.name}-Rect", z=z, df=(x_to-x_from)/x_num, z_unit=self.z_unit, ref_bins=ref_bins,
+        )
     
     def extract_orderslice(self, orders: "OrderList", line_tol: int=3) -> "OrderSliceData":
         xs = self.x # [Hz]
-        ys = self.ref_bins.y
-        zs = self.z # batch x window
-
-        idx = np.argsort(ys)
-        ys = ys[idx]
-        zs = zs[idx]
+        ys, zs = self._sorted_by_ref() # zs: batch x window
 
-        order_slice = OrderSliceData(name="OrderSlice", source=self)
+        order_values = np.fromiter((order.value for order in orders.orders), dtype=float, count=len(orders.orders))
 
-        for order in orders.orders:
-            # slice_element
-            se_x = [] # frequency, [Hz]
-            se_y = [] # ref value, e.g. [rpm]
-            se_z = [] # amplitude, e.g. [mm/s]
+        # all orders and batches at once, (order x batch x window)
+        target_idx = np.searchsorted(xs, order_values[:, None] * ys[None, :])
+        idx_mat = target_idx[..., None] + np.arange(-line_tol, line_tol)
+        np.clip(idx_mat, 0, self.lines-1, out=idx_mat) # windows at both ends stay full length
+        window = np.abs(zs[np.arange(len(ys))[:, None], idx_mat])
+        rel_idx = np.argmax(window, axis=-1)[..., None]
+        final_idx = np.take_along_axis(idx_mat, rel_idx, axis=-1)[..., 0]
+        valid = (target_idx > 0) & (target_idx < self.lines) # target f(0) or out-of-range f
 
-            for ref_y, f_batch in zip(ys, zs):
-                target_x = ref_y * order.value
-                target_idx = np.searchsorted(xs, target_x)
+        # if f already in orderslice? if f not ascending?
+        # how to average? by energy
+        se_f = xs[final_idx] # frequency, [Hz]
+        se_a = np.take_along_axis(window, rel_idx, axis=-1)[..., 0] # amplitude, e.g. [mm/s]
+        se_a[~valid] = 0
 
-                # TODO: avoid f(0)
-                # TODO: avoid out-of-range f
-                rel_idx = np.argmax(np.abs(f_batch[max(target_idx-line_tol,0):(target_idx+line_tol)]))
-                final_a = f_batch[target_idx-line_tol+rel_idx]
-                final_f = xs[target_idx-line_tol+rel_idx]
-
-                se_x.append(final_f)
-                # if f already in orderslice? if f not ascending?
-                se_y.append(ref_y)
-                se_z.append(np.abs(final_a))
-                # how to average? by energy
-
-            order_slice.slices[order] = SliceData(f=se_x, ref=se_y, amplitude=se_z)
-
-        return order_slice
+        return OrderSliceData(name="OrderSlice", source=self, orders=orders.orders, f=se_f, ref=ys, amplitude=se_a)
 
     def reference_to(self, reference: "FreqIntermediateData"):
-        data = np.conj(reference.z) * self.z / np.abs(reference.z)
+        data = np.multiply(np.conj(reference.z), self.z) # dtype from both, e.g. real reference or mixed precision
+        data /= np.abs(reference.z)
         # it's actually rotate self with reference angle
         
         # data = np.mean(data, axis=0)
@@ -244,23 +389,22 @@ class FreqIntermediateData(DataBase):
     def cross_spectrum_with(self, reference: "FreqIntermediateData"):
         
         # assert shape equals, and df, and etc.
-        cross = np.conj(reference.z) * self.z
-        data = np.mean(cross, axis=0)
+        data = _cross_mean(reference.z, self.z)
         coh = np.sqrt(
                 np.abs(data) /
-                (self.to_powerspectrum().y * reference.to_powerspectrum().y)
+                np.sqrt(self._auto_power_mean() * reference._auto_power_mean())
             )
         return FreqDomainData(y=data) # what about coh?
     
     def frf(self, reference: "FreqIntermediateData"):
-        cross12 = np.conj(reference.z) * self.z
-        cross21 = np.conj(self.z) * reference.z
+        cross12 = _cross_mean(reference.z, self.z)
+        cross21 = np.conj(cross12) # mean(conj(Y)*X) = conj(mean(conj(X)*Y))
 
-        spectr1 = np.abs(self.z)**2
-        spectr2 = np.abs(reference.z)**2
+        spectr1 = self._auto_power_mean()
+        spectr2 = reference._auto_power_mean()
 
-        frfH1 = np.mean(cross12, axis=0) / np.mean(spectr2, axis=0) # XY/X^2 ???
-        frfH2 = np.mean(spectr1, axis=0) / np.mean(cross21, axis=0) # Y^2/XY ???
+        frfH1 = cross12 / spectr2 # XY/X^2 ???
+        frfH2 = spectr1 / cross21 # Y^2/XY ???
         # need some theory about: XY v.s. YX
         # and why spectr2 as X^2, spectr1 as Y^2
 
@@ -275,10 +419,11 @@ OrderInfo = namedtuple("OrderInfo", ['name', 'value', 'disp_value'])
     # disp_value: for the case of unit conversion, e.g. 1st order of 1 [rpm] is actually 1/60 [Hz]
 
 class SliceData:
-    def __init__(self, f: np.ndarray, ref: np.ndarray, amplitude: np.ndarray):
-        self.f = np.array(f)
-        self.ref = np.array(ref)
-        self.amplitude = np.array(amplitude)
+    def __init__(self, f: np.ndarray, ref: np.ndarray, amplitude: np.ndarray, dtype: np.dtype=None):
+        # no copy if already ndarray (e.g. row views of `OrderSliceData`)
+        self.f = np.asarray(f, dtype=dtype)
+        self.ref = np.asarray(ref, dtype=dtype)
+        self.amplitude = np.asarray(amplitude, dtype=dtype)
 
     def get_aligned_f(self):
         idx = np.argsort(self.f)
@@ -294,11 +439,41 @@ class OrderList(DataBase):
         self.orders: list[OrderInfo] = orders or []
 
 class OrderSliceData(DataBase):
-    def __init__(self, name: str = None, uuid: str = None, source: FreqIntermediateData = None) -> None:
+    def __init__(self, name: str = None, uuid: str = None, source: FreqIntermediateData = None,
+                 orders: list[OrderInfo]=None, f: np.ndarray=None, ref: np.ndarray=None, amplitude: np.ndarray=None) -> None:
         super().__init__(name, uuid)
 
-        self.slices: dict[OrderInfo, SliceData] = {}
+        # orders x batches, one row per order; all orders share the same reference bins
+        self.f = f if f is not None else np.empty((0, 0)) # frequency, [Hz]
+        self.ref = ref if ref is not None else np.array([]) # ref value, e.g. [rpm]
+        self.amplitude = amplitude if amplitude is not None else np.empty((0, 0)) # e.g. [mm/s]
         self.ref_source: FreqIntermediateData = source
+        self._order_index: dict[OrderInfo, int] = {order: i for i, order in enumerate(orders or [])}
+
+    @property
+    def orders(self) -> list[OrderInfo]:
+        return list(self._order_index)
+
+    @property
+    def slices(self) -> dict[OrderInfo, SliceData]:
+        return {order: self[order] for order in self._order_index}
+
+    def __getitem__(self, order: OrderInfo) -> SliceData:
+        i = self._order_index[order]
+        return SliceData(f=self.f[i], ref=self.ref, amplitude=self.amplitude[i])
     
-    def rectify2freqdata(self): # when speed is uneven, remove high bandwidth
-        pass
\ No newline at end of file
+    def rectify2freqdata(self, order: OrderInfo, f_slice: tuple[float, float, int]) -> FreqDomainData: # when speed is uneven, remove high bandwidth
+        # average the slice amplitudes falling into each frequency bin, bins labelled by their left edge
+        f_from, f_to, f_num = f_slice
+        if f_from != 0:
+            raise ValueError("f_slice must start from 0, `x` of FreqDomainData always does")
+        slice_data = self[order]
+        idxes, valid = _uniform_bin_indices(slice_data.f, f_from, f_to, f_num)
+        idxes = idxes[valid]
+
+        # weighted 1-D histogram, amplitudes are real
+        amp_sum = np.bincount(idxes, weights=slice_data.amplitude[valid], minlength=f_num).astype(slice_data.amplitude.dtype, copy=False)
+        counts = np.bincount(idxes, minlength=f_num)
+        y = np.divide(amp_sum, counts, out=np.zeros_like(amp_sum), where=counts>0) # empty bin as 0
+
+        return FreqDomainData(name=f"{self.name}-{order.name}", y=y, df=(f_to-f_from)/f_num)
\ No newline at end of file
@@ -10,6 +10,8 @@ class TimeData(DataBase):
         self.y_unit = y_unit
         self.comment = comment
         # t0
+        self._x_key = None
+        self._x_cache = None
 
     @property
     def fs(self):
@@ -21,8 +23,23 @@ class TimeData(DataBase):
     
     @property
     def x(self):
-        return np.arange(self.length) * self.dt
+        # cached, invalidated when `length` or `dt` changes
+        if self._x_key != (key:=(self.length, self.dt)):
+            self._x_cache = np.arange(self.length) * self.dt
+            self._x_cache.flags.writeable = False
+            self._x_key = key
+        return self._x_cache
     
+    @staticmethod
+    def ShareX(channels: list["TimeData"]):
+        # channels of one measurement mostly have the same (length, dt), let them hold one axis instead of one each
+        axes = {}
+        for channel in channels:
+            key = (channel.length, channel.dt)
+            if key not in axes:
+                axes[key] = channel.x
+            channel._x_cache, channel._x_key = axes[key], key
+
     @property
     def t(self):
         return self.x # combine with t0
@@ -43,4 +60,54 @@ class TimeData(DataBase):
         return batches
     
     def effective_value(self):
-        return np.sqrt(np.mean(self.y**2))
\ No newline at end of file
+        return np.sqrt(np.mean(self.y**2))
+
+class TimeDataBatch(DataBase):
+    # channels of same `dt` and length as one (channels x samples) array
+    # so actions run one 2-D kernel instead of a loop of 1-D ones; iterates as `TimeData` rows for the others
+    def __init__(self, name: str = None, uuid: str = None, y: np.ndarray=None, dt: float=1,
+                 names: list[str]=None, y_units: list[str]=None, comments: list[str]=None) -> None:
+        super().__init__(name, uuid)
+
+        self.y = np.atleast_2d(y) if y is not None else np.empty((0, 0))
+        self.dt = dt
+        n = len(self.y)
+        self.names = names or [f"Channel-{i}" for i in range(n)]
+        self.y_units = y_units or ["-"] * n
+        self.comments = comments or [""] * n
+
+    @classmethod
+    def FromList(cls, channels: list[TimeData]) -> "TimeDataBatch":
+        assert len({(channel.dt, channel.length) for channel in channels}) == 1, "Channels must share `dt` and length"
+        return cls(
+            y=np.stack([channel.y for channel in channels]), dt=channels[0].dt,
+            names=[channel.name for channel in channels],
+            y_units=[channel.y_unit for channel in channels],
+            comments=[channel.comment for channel in channels],
+        )
+
+    def to_list(self) -> list[TimeData]:
+        return list(self)
+
+    @property
+    def fs(self):
+        return 1/self.dt
+
+    @property
+    def length(self):
+        return self.y.shape[1]
+
+    @property
+    def x(self):
+        return np.arange(self.length) * self.dt
+
+    def __len__(self):
+        return len(self.y)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> TimeData:
+        # row view, no copy
+        return TimeData(name=self.names[i], y=self.y[i], dt=self.dt, y_unit=self.y_units[i], comment=self.comments[i])
@@ -1,23 +1,53 @@
+import os
 import numpy as np
 import re
 from scipy import signal
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from matplotlib.axes import Axes
 
 from dac.core.actions import ActionBase, VAB, PAB, SAB
-from . import TimeData
+from . import TimeData, TimeDataBatch
 from .data_loader import load_tdms
 from ..nvh import FilterType
 
+def _time_index(t: float, dt: float, length: int) -> int:
+    # = np.searchsorted(np.arange(length)*dt, t), by arithmetic
+    i = min(max(int(np.ceil(t/dt)), 0), length)
+    # division may round across a sample, step to match `x[i-1] < t <= x[i]` exactly
+    if i<length and i*dt<t:
+        i += 1
+    elif i>0 and (i-1)*dt>=t:
+        i -= 1
+    return i
+
+def _minmax_decimate(x: np.ndarray, y: np.ndarray, n: int):
+    # min and max of each of about `n` blocks, drawn as a vertical stroke per block
+    # the envelope looks the same as the full line, peaks included
+    block = len(y) // max(n, 1)
+    if block < 2:
+        return x, y
+    idx = np.arange(0, len(y), block)
+    y_pairs = np.empty((len(idx), 2), dtype=y.dtype)
+    np.fmin.reduceat(y, idx, out=y_pairs[:, 0]) # NaN ignored, a block is drawn from its finite samples
+    np.fmax.reduceat(y, idx, out=y_pairs[:, 1])
+    return np.repeat(x[idx], 2), y_pairs.reshape(-1)
+
 class LoadAction(PAB):
     CAPTION = "Load measurement data"
     def __call__(self, fpaths: list[str], ftype: str=None) -> list[TimeData]:
+        fpaths = [fpath for fpath in fpaths if fpath.upper().endswith("TDMS")]
         n = len(fpaths)
-        rst = []
-        for i, fpath in enumerate(fpaths):
-            if not fpath.upper().endswith("TDMS"):
-                continue
-            r = load_tdms(fpath=fpath)
-            rst.extend(r)
-            self.progress(i+1, n)
+        loaded = [None] * n # by index, keep the order of `fpaths`
+
+        # files are independent, reading overlaps with parsing in threads
+        with ThreadPoolExecutor(min(8, os.cpu_count() or 1, n) or 1) as executor:
+            futures = {executor.submit(load_tdms, fpath=fpath): i for i, fpath in enumerate(fpaths)}
+            for done, future in enumerate(as_completed(futures)):
+                loaded[futures[future]] = future.result()
+                self.progress(done+1, n)
+
+        rst = [channel for r in loaded for channel in r]
+        TimeData.ShareX(rst)
         return rst
 
 class TruncAction(ActionBase):
@@ -26,16 +56,22 @@ class TruncAction(ActionBase):
         rst = []
         xfrom, xto = duration
 
-        for i, channel in enumerate(channels):
-            x = channel.x
+        def bounds(dt: float, length: int): # x is k*dt, no need to build it
             if xto==0:
                 idx_to = None
             else:
-                if xto<0:
-                    xto = x[-1] + xto
-                idx_to = np.searchsorted(x, xto)
+                # negative `xto` counts from the end of each channel, don't overwrite it for the next one
+                idx_to = _time_index((length-1)*dt+xto if xto<0 else xto, dt, length)
+            return _time_index(xfrom, dt, length), idx_to
+
+        if isinstance(channels, TimeDataBatch):
+            # same bounds for all rows, one slice of the 2-D array
+            idx_from, idx_to = bounds(channels.dt, channels.length)
+            return TimeDataBatch(y=channels.y[:, idx_from:idx_to], dt=channels.dt, names=[f"{name}-Trunc" for name in channels.names],
+                                 y_units=channels.y_units, comments=channels.comments)
 
-            idx_from = np.searchsorted(x, xfrom)
+        for i, channel in enumerate(channels):
+            idx_from, idx_to = bounds(channel.dt, channel.length)
             y = channel.y[idx_from:idx_to]
             rst.append(TimeData(f"{channel.name}-Trunc", y=y, dt=channel.dt, y_unit=channel.y_unit, comment=channel.comment))
         
@@ -71,10 +107,19 @@ class FilterAction(ActionBase):
         else:
             w = freqs[0]
 
+        if isinstance(channels, TimeDataBatch):
+            # one design, all rows in one 2-D pass
+            sos = signal.butter(order, w / (channels.fs / 2), filter_type.value, output='sos')
+            return TimeDataBatch(y=signal.sosfiltfilt(sos, channels.y, axis=-1), dt=channels.dt, names=[f"{name}-FiltT" for name in channels.names],
+                                 y_units=channels.y_units, comments=channels.comments)
+
+        designs = {} # channels of same sampling share one filter design
         for i, channel in enumerate(channels):
-            Wn = w / (channel.fs / 2)
-            b, a = signal.butter(order, Wn, filter_type.value)
-            y = signal.filtfilt(b, a, channel.y)
+            if (sos:=designs.get(channel.dt)) is None:
+                Wn = w / (channel.fs / 2)
+                # second-order sections, (b, a) polynomials lose precision with higher order or low Wn
+                sos = designs[channel.dt] = signal.butter(order, Wn, filter_type.value, output='sos')
+            y = signal.sosfiltfilt(sos, channel.y)
 
             rst.append(TimeData(name=f"{channel.name}-FiltT", y=y, dt=channel.dt, y_unit=channel.y_unit, comment=channel.comment))
 
@@ -83,11 +128,19 @@ class FilterAction(ActionBase):
 class ResampleAction(ActionBase):
     CAPTION = "Resample data to"
     def __call__(self, channels: list[TimeData], dt: float=1) -> list[TimeData]:
+        if isinstance(channels, TimeDataBatch):
+            interval = round(dt / channels.dt)
+            if interval <= 1:
+                return channels
+            return TimeDataBatch(y=np.ascontiguousarray(channels.y[:, ::interval]), dt=channels.dt*interval, names=channels.names,
+                                 y_units=channels.y_units, comments=channels.comments)
+
         rst = []
         for i, channel in enumerate(channels):
-            interval = int(dt // channel.dt)
+            interval = round(dt / channel.dt) # `//` floors 0.3/0.1 to 2
             if interval > 1:
-                rst.append(TimeData(name=channel.name, y=channel.y[::interval], dt=channel.dt*interval, y_unit=channel.y_unit, comment=channel.comment))
+                y = np.ascontiguousarray(channel.y[::interval]) # compact copy, later processing reads 1/interval of the bytes
+                rst.append(TimeData(name=channel.name, y=y, dt=channel.dt*interval, y_unit=channel.y_unit, comment=channel.comment))
             else:
                 rst.append(channel)
         return rst
@@ -123,6 +176,8 @@ class ShowTimeDataAction(VAB):
         if xlim: ax.set_xlim(xlim)
         if ylim: ax.set_ylim(ylim)
         
+        nx = int(ax.bbox.width) # one min/max pair per pixel column
+        decimated = [] # (line, full x, full y)
         for channel in channels:
             x, y = channel.x, channel.y
             if plot_dt is not None:
@@ -130,18 +185,31 @@ class ShowTimeDataAction(VAB):
                 if interval > 1:
                     x = x[::interval]
                     y = y[::interval]
-            
-            ax.plot(x, y, label=f"{channel.name} [{channel.y_unit}]")
+                ax.plot(x, y, label=f"{channel.name} [{channel.y_unit}]")
+            else:
+                line, = ax.plot(*_minmax_decimate(x, y, nx), label=f"{channel.name} [{channel.y_unit}]")
+                decimated.append((line, x, y))
         
         ax.legend(loc="upper right")
 
+        if decimated:
+            def on_xlim_changed(ax: Axes):
+                for line, x, y in decimated:
+                    visible = self.VisibleSlice(x, ax.get_xlim())
+                    line.set_data(*_minmax_decimate(x[visible], y[visible], nx))
+
+            ax.callbacks.connect('xlim_changed', on_xlim_changed)
+            if xlim: on_xlim_changed(ax)
+
 class CounterToTachoAction(ActionBase):
     CAPTION = "Encoder counter to tacho"
     def __call__(self, channel: TimeData, ppr: int=1024, sr_delta: float=0.1) -> TimeData:
         counter = channel.y
         delta = int(channel.fs * sr_delta)
-        rpm = np.zeros(len(counter))
-        rpm[delta:-delta] = (counter[2*delta:]-counter[:-2*delta]) / ppr / (2*delta*channel.dt / 60)
+        rpm = np.empty(len(counter))
+        # central difference written straight into the output, then scaled in place
+        np.subtract(counter[2*delta:], counter[:-2*delta], out=rpm[delta:-delta]) # in counter dtype, as before
+        rpm[delta:-delta] *= 60 / (ppr*2*delta*channel.dt)
         rpm[:delta] = rpm[delta]
         rpm[-delta:] = rpm[-delta-1]
 
@@ -211,19 +279,39 @@ class PulseToAzimuthAction(ActionBase):
 
         data = channel.y
         inpulse = data>ref_level if higher_as_pulse else data<ref_level
-        indexes = np.arange(len(data))[inpulse]
-        idx_diff = np.diff(indexes)
-        # assert len(idx_diff) == len(indexes)-1
-        idx_pulse_end = indexes[:-1][idx_diff>np.mean(idx_diff)]
-        ang_data = np.zeros_like(data) * np.nan
-        for i, (from_idx, to_idx) in enumerate(zip(idx_pulse_end[:-1], idx_pulse_end[1:])):
+        trans = np.diff(inpulse.view(np.int8)) # 1 at pulse start-1, -1 at pulse end
+        idx_pulse_end = np.flatnonzero(trans==-1)
+        idx_pulse_start = np.flatnonzero(trans==1)
+        if len(idx_pulse_start):
+            # a pulse end counts only when another pulse follows
+            idx_pulse_end = idx_pulse_end[idx_pulse_end<idx_pulse_start[-1]]
+        else:
+            idx_pulse_end = idx_pulse_end[:0]
+        if len(idx_pulse_end) > 1:
+            # debounce: a gap much shorter than the typical gap around it is a dropout within a pulse
+            # typical = 3rd largest of the 7 nearest, local so speed changes pass, robust to 2 pauses or 4 dropouts among them
+            gaps = idx_pulse_start[np.searchsorted(idx_pulse_start, idx_pulse_end)] - idx_pulse_end
+            nearby = np.lib.stride_tricks.sliding_window_view(np.pad(gaps, 3, mode='reflect'), 7)
+            idx_pulse_end = idx_pulse_end[gaps*8 > np.partition(nearby, -3, axis=1)[:, -3]]
+        ang_data = np.full(len(data), np.nan)
+        if len(idx_pulse_end) > 1:
+            # all pulse periods in one pass, each sample knows its period `cycle` and the period start/length
+            first_idx, last_idx = idx_pulse_end[0], idx_pulse_end[-1]
+            lengths = np.diff(idx_pulse_end)
+            cycle = np.repeat(np.arange(len(lengths)), lengths)
             if ref_channel:
-                ref_indexes = (np.arange(from_idx, to_idx) / sr_ratio).astype(int)
-                aligned_subdata = ref_data[ref_indexes]
-                ang_data[from_idx:to_idx] = np.cumsum(aligned_subdata) / np.sum(aligned_subdata) * 360 + 360*i
+                ref_indexes = (np.arange(first_idx, last_idx) / sr_ratio).astype(int)
+                aligned_data = ref_data[ref_indexes]
+                starts = idx_pulse_end[:-1] - first_idx
+                cumsum = np.cumsum(aligned_data)
+                # cumsum within period = global cumsum - cumsum before period start
+                period_before = (cumsum[starts] - aligned_data[starts])[cycle]
+                period_sum = np.add.reduceat(aligned_data, starts)[cycle]
+                ang_data[first_idx:last_idx] = (cumsum - period_before) / period_sum * 360 + 360*cycle
             else:
-                ang_data[from_idx:to_idx] = np.arange(to_idx-from_idx)/(to_idx-from_idx)*360 + 360*i
-        
+                positions = np.arange(first_idx, last_idx) - np.repeat(idx_pulse_end[:-1], lengths)
+                ang_data[first_idx:last_idx] = positions / np.repeat(lengths, lengths) * 360 + 360*cycle
+
         return TimeData(
             name=f"Azi-{channel.name}", dt=channel.dt, y_unit="°",
             y=(ang_data/ppr+phase_shift)%360,
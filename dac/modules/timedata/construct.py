@@ -4,6 +4,36 @@ from collections import namedtuple
 from dac.core.actions import ActionBase
 from . import TimeData
 
+_FFT_COMPONENTS = 160 # from about this many components on, one inverse FFT beats the GEMM (measured at 1M samples)
+
+def _synth_phasor(N: int, omegas: np.ndarray, amps: np.ndarray, phases: np.ndarray) -> np.ndarray:
+    # sample n = i*tile + j, angle addition splits each cosine into two small phasor tables:
+    #   amp*cos(w*n+p) = Re( amp*e^{i(w*i*tile+p)} * e^{i*w*j} )
+    # so cosines are evaluated (blocks + tile) times per component instead of N times, the rest is one GEMM
+    tile = max(int(np.ceil(np.sqrt(N))), 1)
+    blocks = -(-N // tile)
+    block_phases = np.multiply.outer(np.arange(blocks) * tile, omegas) + phases # blocks x components
+    tile_phases = np.multiply.outer(omegas, np.arange(tile)) # components x tile
+    P = np.hstack((amps*np.cos(block_phases), -amps*np.sin(block_phases)))
+    Q = np.vstack((np.cos(tile_phases), np.sin(tile_phases)))
+
+    y = np.empty((blocks, tile))
+    np.matmul(P, Q, out=y)
+    return y.reshape(-1)[:N]
+
+def _synth_irfft(N: int, bins: np.ndarray, amps: np.ndarray, phases: np.ndarray) -> np.ndarray:
+    # every component completes whole cycles in N samples, i.e. sits on an FFT bin:
+    # place amp/2*e^{ip} in a half spectrum and one inverse real FFT sums them all, O(N log N) for any count
+    bins = bins % N # aliasing, as sampling would do
+    mirrored = bins > N//2 # upper half is the conjugate of the lower one
+    bins = np.where(mirrored, N-bins, bins)
+    phasors = amps * np.exp(1j*np.where(mirrored, -phases, phases))
+    # f(0) and Nyquist have no conjugate partner, they carry the full real part
+    phasors = np.where((bins==0) | (2*bins==N), phasors.real, phasors/2)
+
+    spec = np.bincount(bins, weights=phasors.real, minlength=N//2+1) + 1j*np.bincount(bins, weights=phasors.imag, minlength=N//2+1)
+    return np.fft.irfft(spec, n=N, norm="forward") # no 1/N in the inverse, amplitudes as placed
+
 CosineComponent = namedtuple("CosineComponent", ['freq', 'amp', 'phase'])
 
 class SignalConstructAction(ActionBase):
@@ -30,10 +60,15 @@ class SignalConstructAction(ActionBase):
             
         """
 
-        t = np.arange(int(duration * fs)) / fs
-        y = np.zeros_like(t) + offset
-        
-        for freq, amp, phase in components:
-            y += amp*np.cos(2*np.pi*freq*t + np.deg2rad(phase))
+        N = int(duration * fs)
+        freqs, amps, phases = np.asarray(components, dtype=float).reshape(-1, 3).T
+        omegas, phases = 2*np.pi*freqs/fs, np.deg2rad(phases) # [rad/sample]
+
+        bins = freqs * N / fs # cycles within N samples
+        if N > 0 and len(freqs) >= _FFT_COMPONENTS and np.allclose(bins, np.round(bins), rtol=0, atol=1e-9):
+            y = _synth_irfft(N, np.round(bins).astype(int), amps, phases)
+        else:
+            y = _synth_phasor(N, omegas, amps, phases)
+        y += offset
 
         return TimeData(name="Generated signal", y=y, dt=1/fs, y_unit="-", comment="Constructed time data")
\ No newline at end of file
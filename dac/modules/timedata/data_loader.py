@@ -1,30 +1,23 @@
-from nptdms import TdmsFile, TdmsGroup, TdmsChannel
+from nptdms import TdmsFile
 from nptdms import TdmsWriter, RootObject, GroupObject, ChannelObject
 
-from collections import OrderedDict
 from . import TimeData
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 
-def load_tdms(fpath) -> list[TimeData]:
-    r = []
-    f = TdmsFile(fpath, read_metadata_only=False, keep_open=False)
-    for g in f.groups():
-        g: TdmsGroup
-        for c in g.channels():
-            c: TdmsChannel
-            prop: OrderedDict = c.properties
-
-            gain = float(prop['Gain'])
-            offset = float(prop['Offset'])
-            y_unit = prop['Unit']
-            desc = prop['Description']
-            x_unit = prop['wf_xunit_string']
-            dt = float(prop['wf_increment'])
-            # length = prop['wf_samples']
+_K_DT = 'wf_increment'
+_K_UNIT = 'Unit'
+_K_UNIT_ALT = 'unit_string' # written by save_tdms
+_K_DESC = 'Description'
 
-            r.append(TimeData(name=c.name, y=c.data, dt=dt, y_unit=y_unit, comment=desc))
-
-    return r
+def load_tdms(fpath) -> list[TimeData]:
+    # one pass over the file; per-channel reads would re-walk every segment
+    # 'Gain', 'Offset', 'wf_xunit_string' and 'wf_samples' were read but never used, not looked up anymore
+    f = TdmsFile.read(fpath)
+    return [
+        TimeData(name=c.name, y=c.data, dt=float(c.properties[_K_DT]),
+                 y_unit=c.properties.get(_K_UNIT, c.properties.get(_K_UNIT_ALT, "-")), comment=c.properties.get(_K_DESC, ""))
+        for g in f.groups() for c in g.channels()
+    ]
 
 def save_tdms(channels: list[TimeData], fpath: str, start_time: datetime, group_name: str="group_1"):
     current_tz = datetime.now().astimezone().tzinfo